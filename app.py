@@ -1,21 +1,45 @@
 
 from __future__ import annotations
 
+import hmac
 import io
 import os
 import re
 import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from datetime import date, datetime
-from itertools import count
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import Any
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
+import orjson
 import pyminizip
 import pyzipper
-from flask import Flask, jsonify, render_template, request, send_file, session
-from supabase import Client, create_client
+from flask import Flask, Request, jsonify, render_template, request, send_file, session
+from flask.json.provider import JSONProvider
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
+if TYPE_CHECKING:
+    from supabase import Client
+
+try:
+    # zlib-ng は SIMD 最適化された DEFLATE 実装（API は zlib 互換）
+    from zlib_ng import zlib_ng as zlib
+
+    # zlib-ng の level 1 は圧縮率を捨てる専用戦略で、圧縮できないデータを数 % 膨らませる。
+    # level 2 で stdlib zlib の level 1 と同等の圧縮率になり、それでも stdlib より速い
+    _DEFLATE_MIN_LEVEL = 2
+except ImportError:  # pragma: no cover - optional accelerator
+    import zlib
+
+    _DEFLATE_MIN_LEVEL = 1
+
 from password_rules import (
     CUSTOM_CLIENT_KEY,
     DEFAULT_CLIENTS,
@@ -26,6 +50,7 @@ from password_rules import (
     delete_client_rule,
     generate_password,
     get_available_clients,
+    get_available_clients_json,
     set_supabase_client,
     update_client_rule,
 )
@@ -43,6 +68,55 @@ try:
 except ImportError as exc:  # pragma: no cover - ensures clearer error for missing config
     raise RuntimeError("config.py が見つかりません。管理者パスワードを設定してください。") from exc
 
+try:
+    from config import SERVER_THREADS
+except ImportError:  # 既存の config.py に SERVER_THREADS が無くても起動できるようにする
+    SERVER_THREADS = 16
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that encodes and decodes with orjson."""
+
+    mimetype = "application/json"
+    sort_keys = False
+    default: Callable[[Any], Any] | None = None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            raise TypeError(f"OrjsonProvider.loads does not support: {', '.join(sorted(kwargs))}")
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        # str を経由せず、orjson の UTF-8 bytes をそのまま応答本文にする
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+
+    def _dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool | None = None,
+        default: Callable[[Any], Any] | None = None,
+        separators: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        # 対応できないオプションは黙って無視せずエラーにする
+        if kwargs:
+            raise TypeError(f"OrjsonProvider.dumps does not support: {', '.join(sorted(kwargs))}")
+        # orjson の出力は常にコンパクト形式 (セッション Cookie の直列化が指定する形)
+        if separators is not None and tuple(separators) != (",", ":"):
+            raise TypeError("OrjsonProvider.dumps only supports compact separators")
+        if sort_keys is None:
+            sort_keys = self.sort_keys
+        return orjson.dumps(
+            obj,
+            default=default or self.default,
+            option=orjson.OPT_SORT_KEYS if sort_keys else 0,
+        )
+
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "templates"
@@ -52,7 +126,22 @@ app = Flask(
     __name__, template_folder=str(TEMPLATES_DIR), static_folder=str(STATIC_DIR)
 )
 MAX_UPLOAD_ARCHIVE_SIZE = 512 * 1024 * 1024  # 512MB
+ZIP_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # これを超えた ZIP はディスクへ退避する
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # アップロードを読み進める単位
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # これ以下のリクエストはアップロードをメモリに保持する
+# 対話的なダウンロード用途のため、既定は圧縮率より速度を優先したレベル 1
+DEFAULT_COMPRESS_LEVEL = 1
+# 既に圧縮済みの形式は DEFLATE しても縮まないため、圧縮処理を省いて格納する
+PRECOMPRESSED_SUFFIXES = frozenset(
+    {
+        ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst",
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+        ".mp3", ".m4a", ".aac", ".mp4", ".mov", ".m4v", ".webm", ".mkv",
+        ".docx", ".xlsx", ".pptx",
+    }
+)
 
+app.json = OrjsonProvider(app)
 app.secret_key = FLASK_SECRET
 app.config.update(
     SESSION_COOKIE_SECURE=SESSION_COOKIE_SECURE,
@@ -61,6 +150,12 @@ app.config.update(
 )
 app.config.setdefault("SESSION_COOKIE_HTTPONLY", True)
 
+# DEFLATE ワーカーはリクエスト間で共有し、スレッド生成コストを毎回払わない
+DEFLATE_WORKERS = os.cpu_count() or 1
+_DEFLATE_POOL = ThreadPoolExecutor(
+    max_workers=DEFLATE_WORKERS, thread_name_prefix="monozip-deflate"
+)
+
 resolved_path = Path(__file__).resolve()
 app.logger.info("[MonoZip] Using app.py at: %s", resolved_path)
 app.logger.info("[MonoZip] templates -> %s", TEMPLATES_DIR)
@@ -69,6 +164,9 @@ app.logger.info("[MonoZip] static -> %s", STATIC_DIR)
 supabase_client: Client | None = None
 if SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY:
     try:
+        # supabase の import は重いため、設定があるときだけ読み込む
+        from supabase import create_client
+
         supabase_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
         app.logger.info("[MonoZip] Supabase client initialized.")
         try:
@@ -116,27 +214,280 @@ def _build_default_client_payload() -> list[dict[str, str]]:
     return clients
 
 
+# 既定クライアントは定数なので、ストレージ障害時の応答はインポート時に一度だけ組み立てる
+_DEFAULT_CLIENTS_RESPONSE = orjson.dumps(
+    {"clients": _build_default_client_payload(), "fallback": True}
+)
+
+
+def _password_matches(candidate: Any, expected: str) -> bool:
+    """Compare a submitted password against the configured one in constant time."""
+    if not isinstance(candidate, str):
+        return False
+    return hmac.compare_digest(candidate.encode("utf-8"), expected.encode("utf-8"))
+
+
+def _is_precompressed(filename: str) -> bool:
+    """Return True when the file extension denotes already-compressed content."""
+    return Path(filename).suffix.lower() in PRECOMPRESSED_SUFFIXES
+
+
+# secure_filename が変更しない ASCII 名 (先頭・末尾が "." / "_" でないもの)
+_SAFE_FILENAME_RE = re.compile(r"\A[A-Za-z0-9-](?:[A-Za-z0-9._-]*[A-Za-z0-9-])?\Z")
+
+
+def _safe_filename(filename: str) -> str:
+    """Return ``secure_filename(filename)``, skipping the work for safe ASCII names."""
+    # Windows では予約デバイス名の置換があるため常に secure_filename を通す
+    if os.name != "nt" and _SAFE_FILENAME_RE.match(filename):
+        return filename
+    return _secure_filename_cached(filename)
+
+
+@lru_cache(maxsize=4096)
+def _secure_filename_cached(filename: str) -> str:
+    """Memoized ``secure_filename``; upload batches often repeat file names."""
+    return secure_filename(filename)
+
+
+def _stream_size(stream: IO[bytes]) -> int:
+    """Return the byte length of a seekable upload stream and rewind it."""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _deflate_stream(stream: IO[bytes], level: int) -> tuple[IO[bytes], int]:
+    """Compress an upload into a spooled raw DEFLATE file, returning (payload, size).
+
+    zlib releases the GIL while compressing, so this runs in worker threads.
+    No CRC is computed: pyzipper writes WZ_AES entries as AE-2, which stores a
+    zero CRC and relies on the HMAC for integrity.
+    """
+    compressor = zlib.compressobj(max(level, _DEFLATE_MIN_LEVEL), zlib.DEFLATED, -15)
+    # 圧縮結果はアップロードと同じしきい値でディスクへ退避し、
+    # エントリ全体をメモリに抱えない
+    payload = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE, mode="w+b")
+    size = 0
+    stream.seek(0)
+    for chunk in _iter_chunks(stream):
+        size += len(chunk)
+        payload.write(compressor.compress(chunk))
+    payload.write(compressor.flush())
+    payload.seek(0)
+    return payload, size
+
+
+def _deflate_in_order(streams: Iterable[IO[bytes]], level: int) -> Iterator[tuple[IO[bytes], int]]:
+    """Deflate uploads on the shared pool, yielding results in input order.
+
+    At most ``DEFLATE_WORKERS`` uploads are in flight, so only that many
+    compressed entries are spooled at once.
+    """
+    pending: deque[Future[tuple[IO[bytes], int]]] = deque()
+    remaining = iter(streams)
+    try:
+        for stream in islice(remaining, DEFLATE_WORKERS):
+            pending.append(_DEFLATE_POOL.submit(_deflate_stream, stream, level))
+        while pending:
+            result = pending.popleft().result()
+            for stream in islice(remaining, 1):
+                pending.append(_DEFLATE_POOL.submit(_deflate_stream, stream, level))
+            yield result
+    finally:
+        # 中断された場合、未着手のジョブは取り消す。実行中のジョブはアップロードが
+        # 閉じられる前に終わるのを待ち、出力した一時ファイルを閉じる
+        for future in pending:
+            future.cancel()
+        for future in pending:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            payload, _ = future.result()
+            payload.close()
+
+
+def _iter_chunks(stream: IO[bytes]) -> Iterator[memoryview]:
+    """Yield views over one reused read buffer; each view is valid until the next."""
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while size := stream.readinto(buffer):
+        yield view[:size]
+
+
+def _write_deflated_entry(
+    archive: pyzipper.AESZipFile, zinfo: pyzipper.ZipInfo, payload: IO[bytes], size: int
+) -> None:
+    """Write a pre-compressed payload as an encrypted archive entry.
+
+    pyzipper compresses inside its entry writer, so the writer's compressor is
+    disabled and the payload is encrypted in ``UPLOAD_CHUNK_SIZE`` chunks; the
+    size is filled in from the worker result. This relies on the internals of
+    the pyzipper version pinned in requirements.txt.
+    """
+    zinfo.file_size = size
+    with archive.open(zinfo, mode="w") as entry:
+        entry._compressor = None
+        _write_encrypted(entry, _iter_chunks(payload))
+        entry._file_size = size
+
+
+def _write_stored_entry(archive: pyzipper.AESZipFile, zinfo: pyzipper.ZipInfo, stream: IO[bytes]) -> None:
+    """Write an upload uncompressed as an encrypted archive entry.
+
+    The upload is encrypted chunk by chunk without being read into bytes, and
+    like deflated entries it skips the writer's CRC-32 pass (AE-2 stores a
+    zero CRC).
+    """
+    size = _stream_size(stream)
+    zinfo.file_size = size
+    with archive.open(zinfo, mode="w") as entry:
+        _write_encrypted(entry, _iter_chunks(stream))
+        entry._file_size = size
+
+
+def _write_encrypted(entry: Any, chunks: Iterable[memoryview]) -> None:
+    """Encrypt and append raw entry data, bypassing the writer's compressor/CRC."""
+    encrypt = entry._encrypter.encrypt
+    output = entry._fileobj
+    for chunk in chunks:
+        data = encrypt(chunk)
+        entry._compress_size += len(data)
+        output.write(data)
+
+
+def _raw_entry_writes_supported() -> bool:
+    """Round-trip a tiny archive through the raw entry writers.
+
+    The writers depend on private ``_ZipWriteFile`` attributes, so a pyzipper
+    release that changes them must fail here rather than emit corrupt archives.
+    """
+    sample = b"monozip" * 64
+    compressor = zlib.compressobj(DEFAULT_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    deflated = io.BytesIO(compressor.compress(sample) + compressor.flush())
+    buffer = io.BytesIO()
+    try:
+        with pyzipper.AESZipFile(buffer, mode="w", encryption=pyzipper.WZ_AES) as archive:
+            archive.setpassword(b"probe")
+            zinfo = archive.zipinfo_cls("deflated")
+            zinfo.compress_type = pyzipper.ZIP_DEFLATED
+            _write_deflated_entry(archive, zinfo, deflated, len(sample))
+            zinfo = archive.zipinfo_cls("stored")
+            zinfo.compress_type = pyzipper.ZIP_STORED
+            _write_stored_entry(archive, zinfo, io.BytesIO(sample))
+        with pyzipper.AESZipFile(buffer) as archive:
+            archive.setpassword(b"probe")
+            # AE-2 なので CRC 欄は 0、整合性は HMAC で検証される
+            return all(
+                archive.getinfo(name).CRC == 0 and archive.read(name) == sample
+                for name in ("deflated", "stored")
+            )
+    except Exception:
+        return False
+
+
+# pyzipper の内部構造が想定と異なる場合は、並列圧縮をやめて公開 API で書き込む
+RAW_ENTRY_WRITES = _raw_entry_writes_supported()
+if not RAW_ENTRY_WRITES:  # pragma: no cover - depends on the installed pyzipper
+    app.logger.warning(
+        "pyzipper %s の内部構造が想定と異なるため、AES ZIP は逐次圧縮で生成します。",
+        getattr(pyzipper, "__version__", "?"),
+    )
+
+
+def _open_temporary(path: str) -> IO[bytes]:
+    """Open a finished temp file for reading; it is removed once closed."""
+    # Windows は O_TEMPORARY で close 時に削除し、POSIX は開いたまま unlink する
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_TEMPORARY", 0)
+    fd = os.open(path, flags)
+    if not hasattr(os, "O_TEMPORARY"):
+        os.unlink(path)
+    return os.fdopen(fd, "rb")
+
+
+def parse_compress_level(value: str | None) -> int:
+    """Parse the optional DEFLATE level, clamped to 1-9. Defaults to level 1."""
+    try:
+        level = int(value or "")
+    except ValueError:
+        return DEFAULT_COMPRESS_LEVEL
+    return min(max(level, 1), 9)
+
+
 def parse_date(value: str | None) -> date:
     """Parse YYYY-MM-DD strings into date objects. Defaults to today if missing."""
     if not value:
         return date.today()
     try:
+        # 通常の 10 文字形式は strptime のロケール処理を通さず直接組み立てる
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            year, month, day = value[:4], value[5:7], value[8:]
+            if year.isdigit() and month.isdigit() and day.isdigit():
+                return date(int(year), int(month), int(day))
         return datetime.strptime(value, "%Y-%m-%d").date()
     except ValueError as exc:
         raise PasswordRuleError("日付は YYYY-MM-DD 形式で入力してください。") from exc
 
 
+_RENDERED_PAGES: dict[str, str] = {}
+
+
+def _render_page(template_name: str) -> str:
+    """Render a context-free template once and reuse the HTML afterwards."""
+    page = _RENDERED_PAGES.get(template_name)
+    if page is None or app.debug:
+        page = render_template(template_name)
+        _RENDERED_PAGES[template_name] = page
+    return page
+
+
 _PUBLIC_PATHS = {"/login", "/logout"}
 _PUBLIC_PREFIXES = ("/static/", "/favicon.ico", "/api/public/")
 
 
+class PublicPathSessionInterface(SecureCookieSessionInterface):
+    """Cookie session that is not verified for public assets.
+
+    Flask opens the session for every request, so without this each static
+    file request would parse the cookie and check its HMAC for nothing.
+    """
+
+    def open_session(self, app: Flask, request: Any) -> Any:
+        if request.path.startswith(_PUBLIC_PREFIXES):
+            return self.session_class()
+        return super().open_session(app, request)
+
+
+app.session_interface = PublicPathSessionInterface()
+
+
+class UploadRequest(Request):
+    """Request that buffers multipart uploads based on the whole body size."""
+
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> IO[bytes]:
+        # 既定は 500KB を超えるとディスクへ移す。小さなリクエストはメモリだけで完結させ、
+        # 大きなリクエストは最初からディスクへ書いて途中のロールオーバーコピーを避ける
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_MAX_SIZE:
+            return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE, mode="w+b")
+        return tempfile.TemporaryFile(mode="w+b")
+
+
+app.request_class = UploadRequest
+
+
 @app.before_request
 def enforce_authentication():
     if request.method == "OPTIONS":
         return None
 
     path = request.path
-    if path in _PUBLIC_PATHS or any(path.startswith(prefix) for prefix in _PUBLIC_PREFIXES):
+    if path in _PUBLIC_PATHS or path.startswith(_PUBLIC_PREFIXES):
         return None
 
     if session.get("auth"):
@@ -145,14 +496,14 @@ def enforce_authentication():
     if request.accept_mimetypes.best == "application/json":
         return jsonify({"error": "unauthorized"}), 401
 
-    return render_template("login.html"), 401
+    return _render_page("login.html"), 401
 
 
 @app.get("/login")
 def login_form() -> Any:
     if session.get("auth"):
-        return render_template("index.html")
-    return render_template("login.html")
+        return _render_page("index.html")
+    return _render_page("login.html")
 
 
 @app.post("/login")
@@ -161,7 +512,7 @@ def login() -> Any:
     password_value = (
         payload.get("password") if isinstance(payload, dict) else request.form.get("password")
     )
-    if (password_value or "").strip() == LOGIN_PASSWORD:
+    if _password_matches((password_value or "").strip(), LOGIN_PASSWORD):
         session["auth"] = True
         return jsonify({"ok": True})
     return jsonify({"error": "invalid password"}), 403
@@ -175,22 +526,17 @@ def logout() -> Any:
 
 @app.get("/api/clients")
 def list_clients() -> Any:
-    fallback_used = False
     try:
-        clients = get_available_clients()
+        # キャッシュ済みのシリアライズ結果をそのまま返す
+        return app.response_class(
+            get_available_clients_json(), mimetype=app.json.mimetype
+        )
     except PasswordRuleError as err:
         app.logger.error("クライアント情報の取得に失敗: %s", err)
-        clients = _build_default_client_payload()
-        fallback_used = True
     except Exception as exc:  # pragma: no cover - defensive
         app.logger.exception("クライアント情報取得で予期しないエラー: %s", exc)
-        clients = _build_default_client_payload()
-        fallback_used = True
 
-    response: dict[str, Any] = {"clients": clients}
-    if fallback_used:
-        response["fallback"] = True
-    return jsonify(response)
+    return app.response_class(_DEFAULT_CLIENTS_RESPONSE, mimetype=app.json.mimetype)
 
 
 @app.post("/api/generate")
@@ -238,7 +584,7 @@ def api_add_client() -> Any:
             400,
         )
 
-    if admin_password != ADMIN_PASSWORD:
+    if not _password_matches(admin_password, ADMIN_PASSWORD):
         app.logger.warning("管理者パスワード不一致のためクライアント追加を拒否しました。")
         return (
             jsonify({"success": False, "error": "管理者パスワードが正しくありません。"}),
@@ -280,7 +626,7 @@ def api_update_client() -> Any:
             400,
         )
 
-    if admin_password != ADMIN_PASSWORD:
+    if not _password_matches(admin_password, ADMIN_PASSWORD):
         return (
             jsonify({"success": False, "error": "管理者パスワードが正しくありません。"}),
             403,
@@ -305,6 +651,22 @@ def api_update_client() -> Any:
 def api_zip() -> Any:
     app.logger.debug("/api/zip invoked via %s", request.method)
 
+    # 本文を 1 バイトも読む前に Content-Length で上限超過を弾く。ヘッダーがない
+    # 場合も MAX_CONTENT_LENGTH によりフォーム解析時に 413 となる
+    if request.content_length and request.content_length > MAX_UPLOAD_ARCHIVE_SIZE:
+        app.logger.warning(
+            "ZIP生成リクエストがサイズ上限を超過: %d bytes", request.content_length
+        )
+        return (
+            jsonify(
+                {
+                    "error": "アップロード合計サイズが上限を超えています。",
+                    "limit": MAX_UPLOAD_ARCHIVE_SIZE,
+                }
+            ),
+            413,
+        )
+
     form = request.form
     files = request.files.getlist("files")
 
@@ -322,12 +684,16 @@ def api_zip() -> Any:
         app.logger.warning("不正な暗号方式が指定されました: %s", mode)
         return jsonify({"error": "対応していない暗号方式が指定されました。"}), 400
 
+    compress_level = parse_compress_level(form.get("level"))
+
+    # 既定名用のタイムスタンプはリクエストごとに 1 回だけ整形する
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     requested_name = (form.get("zip_name") or "").strip()
-    normalized_name = secure_filename(requested_name) if requested_name else ""
+    normalized_name = _safe_filename(requested_name) if requested_name else ""
     if normalized_name and not normalized_name.lower().endswith(".zip"):
         normalized_name = f"{normalized_name}.zip"
     if not normalized_name:
-        normalized_name = f"monozip_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        normalized_name = f"monozip_{timestamp}.zip"
 
     folder_candidate = Path(requested_name or normalized_name).stem
     folder_candidate = re.sub(r'[\\/:*?"<>|]+', "_", folder_candidate).strip(" .")
@@ -335,121 +701,161 @@ def api_zip() -> Any:
         folder_candidate = Path(normalized_name).stem
         folder_candidate = re.sub(r'[\\/:*?"<>|]+', "_", folder_candidate).strip(" .")
     if not folder_candidate:
-        folder_candidate = f"monozip_{datetime.now().strftime('%Y%m%d_%H%M')}"
+        folder_candidate = f"monozip_{timestamp[:-2]}"
     folder_name = folder_candidate
 
-    collected_files: list[tuple[str, bytes]] = []
+    collected_files: list[tuple[str, FileStorage]] = []
     total_size = 0
     fallback_names = (f"file_{i}" for i in count(1))
 
     for storage in files:
         original_name = storage.filename or ""
-        safe_name = secure_filename(original_name)
-        safe_name = os.path.basename(safe_name)
-        if not safe_name:
-            safe_name = next(fallback_names)
+        # secure_filename は区切り文字を除去するため basename は不要
+        safe_name = _safe_filename(original_name) or next(fallback_names)
 
-        try:
-            storage.stream.seek(0)
-            data = storage.read()
-        finally:
+        size = _stream_size(storage.stream)
+        if not size:
             storage.close()
-
-        if not data:
             continue
 
-        total_size += len(data)
-        if total_size > MAX_UPLOAD_ARCHIVE_SIZE:
-            app.logger.warning(
-                "ZIP生成リクエストがサイズ上限を超過: %d bytes", total_size
-            )
-            return (
-                jsonify(
-                    {
-                        "error": "アップロード合計サイズが上限を超えています。",
-                        "limit": MAX_UPLOAD_ARCHIVE_SIZE,
-                    }
-                ),
-                413,
-            )
-
-        collected_files.append((safe_name, data))
+        total_size += size
+        collected_files.append((safe_name, storage))
 
     if not collected_files:
         app.logger.warning("ZIP生成リクエストに有効ファイルがありませんでした。")
         return jsonify({"error": "有効なファイルが選択されていません。"}), 400
 
     password_bytes = password.encode("utf-8")
-    zip_stream: io.BytesIO | None = None
+    zip_stream: IO[bytes] | None = None
 
     try:
         if mode == "aes":
-            zip_stream = io.BytesIO()
+            zip_stream = tempfile.SpooledTemporaryFile(
+                max_size=ZIP_SPOOL_MAX_SIZE, mode="w+b"
+            )
+            # 各エントリは独立した DEFLATE ストリームなので、圧縮はワーカーで並列に行い
+            # 書き込み (暗号化) だけを元の順序でこのスレッドから行う
+            deflate_streams = [
+                storage.stream
+                for filename, storage in collected_files
+                if RAW_ENTRY_WRITES and not _is_precompressed(filename)
+            ]
             with pyzipper.AESZipFile(
                 zip_stream,
                 mode="w",
                 compression=pyzipper.ZIP_DEFLATED,
+                compresslevel=compress_level,
                 encryption=pyzipper.WZ_AES,
             ) as archive:
                 archive.setpassword(password_bytes)
+                # AES-CTR / HMAC-SHA1 / PBKDF2 は pyzipper が pycryptodomex (C 実装、
+                # AES-NI 対応) に委譲するため、暗号化処理の差し替えは不要
                 archive.setencryption(pyzipper.WZ_AES, nbits=256)
-                for filename, data in collected_files:
-                    archive.writestr(f"{folder_name}/{filename}", data)
+                # 途中で失敗しても、先行して投入した圧縮ジョブを取り消し・回収する
+                with closing(_deflate_in_order(deflate_streams, compress_level)) as deflated_results:
+                    for filename, storage in collected_files:
+                        zinfo = archive.zipinfo_cls(
+                            filename=f"{folder_name}/{filename}",
+                            date_time=time.localtime()[:6],
+                        )
+                        zinfo.external_attr = 0o600 << 16
+                        if not RAW_ENTRY_WRITES:
+                            zinfo.compress_type = (
+                                pyzipper.ZIP_STORED
+                                if _is_precompressed(filename)
+                                else pyzipper.ZIP_DEFLATED
+                            )
+                            with archive.open(zinfo, mode="w") as entry:
+                                for chunk in _iter_chunks(storage.stream):
+                                    entry.write(chunk)
+                        elif _is_precompressed(filename):
+                            zinfo.compress_type = pyzipper.ZIP_STORED
+                            _write_stored_entry(archive, zinfo, storage.stream)
+                        else:
+                            payload, size = next(deflated_results)
+                            with payload:
+                                if _stream_size(payload) < size:
+                                    zinfo.compress_type = pyzipper.ZIP_DEFLATED
+                                    _write_deflated_entry(archive, zinfo, payload, size)
+                                else:
+                                    # 圧縮しても縮まないデータは元のアップロードを無圧縮で格納する
+                                    zinfo.compress_type = pyzipper.ZIP_STORED
+                                    _write_stored_entry(archive, zinfo, storage.stream)
+                        # 書き込み済みのアップロードはリクエスト終了を待たずに解放する
+                        storage.close()
         else:
-            with tempfile.TemporaryDirectory(prefix="monozip-", dir="/tmp") as tmp_dir:
+            with tempfile.TemporaryDirectory(prefix="monozip-") as tmp_dir:
                 tmp_path = Path(tmp_dir)
                 zip_root = tmp_path / folder_name
                 zip_root.mkdir(parents=True, exist_ok=True)
-                for filename, data in collected_files:
+                # 保存したパスをそのまま使い、ディレクトリの再走査はしない。
+                # 同名ファイルは後勝ち (上書き保存と同じ挙動)
+                saved_paths: dict[str, str] = {}
+                for filename, storage in collected_files:
                     file_path = zip_root / filename
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-                    file_path.write_bytes(data)
-
-                source_paths: list[str] = []
-                archive_names: list[str] = []
-                for file_path in sorted(zip_root.rglob("*")):
-                    if file_path.is_file():
-                        source_paths.append(str(file_path))
-                        # ZIP 内のパスを MonoZip_日時/ファイル名 に統一する
-                        archive_names.append(f"{folder_name}/{file_path.name}")
-
-                app.logger.info("=== DEBUG archive_names ===")
-                for arcname in archive_names:
-                    app.logger.info("arcname: %s", arcname)
-                app.logger.info("===========================")
-
-                zip_path = tmp_path / normalized_name
-                pyminizip.compress_multiple(
-                    source_paths,
-                    archive_names,
-                    str(zip_path),
-                    password,
-                    5,
+                    storage.save(file_path, buffer_size=UPLOAD_CHUNK_SIZE)
+                    storage.close()
+                    saved_paths[filename] = str(file_path)
+
+                ordered_names = sorted(saved_paths)
+                source_paths = [saved_paths[name] for name in ordered_names]
+                # ZIP 内のパスを MonoZip_日時/ファイル名 に統一する
+                archive_names = [f"{folder_name}/{name}" for name in ordered_names]
+
+                # pyminizip は全エントリ共通のレベルしか指定できないため、
+                # すべて圧縮済み形式のときだけ無圧縮 (0) にする
+                minizip_level = (
+                    0
+                    if all(_is_precompressed(name) for name, _ in collected_files)
+                    else compress_level
                 )
-                zip_stream = io.BytesIO(zip_path.read_bytes())
+                # 出力 ZIP は作業ディレクトリの外の実ファイルとし、読み戻さずにそのまま
+                # 返す。pyminizip がパスを開き直すため、開いたままのハンドルは渡さない
+                fd, zip_path = tempfile.mkstemp(prefix="monozip-", suffix=".zip")
+                os.close(fd)
+                try:
+                    pyminizip.compress_multiple(
+                        source_paths,
+                        archive_names,
+                        zip_path,
+                        password,
+                        minizip_level,
+                    )
+                    zip_stream = _open_temporary(zip_path)
+                finally:
+                    if zip_stream is None:
+                        os.unlink(zip_path)
     except Exception:  # pragma: no cover - runtime safeguard
         app.logger.exception("ZIP生成に失敗しました (mode=%s)", mode)
+        if zip_stream is not None:
+            zip_stream.close()
         return jsonify({"error": "ZIPファイルの生成に失敗しました。"}), 500
 
     if zip_stream is None:
         app.logger.error("ZIP生成に失敗しました (mode=%s): 出力ストリームが空です。", mode)
         return jsonify({"error": "ZIPファイルの生成に失敗しました。"}), 500
 
-    zip_stream.seek(0)
     app.logger.info(
-        "ZIP生成成功: %s (%d files, %d bytes, mode=%s)",
+        "ZIP生成成功: %s (%d files, %d bytes, mode=%s, level=%d)",
         normalized_name,
         len(collected_files),
         total_size,
         mode,
+        compress_level,
     )
-    return send_file(
+    zip_size = _stream_size(zip_stream)
+    # ファイルオブジェクトは wsgi.file_wrapper 経由でチャンク単位に送出される
+    # (waitress は sendfile を使わないが、ZIP 全体を bytes に読み込むことはない)
+    response = send_file(
         zip_stream,
         mimetype="application/zip",
         as_attachment=True,
         download_name=normalized_name,
+        conditional=False,
         max_age=0,
     )
+    response.content_length = zip_size
+    return response
 
 
 @app.post("/api/delete_client")
@@ -467,7 +873,7 @@ def api_delete_client() -> Any:
             400,
         )
 
-    if admin_password != ADMIN_PASSWORD:
+    if not _password_matches(admin_password, ADMIN_PASSWORD):
         return (
             jsonify({"success": False, "error": "管理者パスワードが正しくありません。"}),
             403,
@@ -492,7 +898,7 @@ def api_delete_client() -> Any:
 def root() -> Any:
     template_path = TEMPLATES_DIR / "index.html"
     app.logger.info("Rendering template: %s", template_path)
-    return render_template("index.html")
+    return _render_page("index.html")
 
 
 @app.after_request
@@ -508,6 +914,10 @@ def add_cors_headers(response):
 
 
 if __name__ == "__main__":
+    from waitress import serve
+
     print("Running Flask app from:", __file__)
-    app.logger.info("[MonoZip] Starting development server from: %s", resolved_path)
-    app.run(debug=True)
+    app.logger.info("[MonoZip] Starting waitress server from: %s", resolved_path)
+    # 開発サーバーではなくマルチスレッドの WSGI サーバーで動かし、ZIP 生成中も
+    # /api/clients などの軽いリクエストが待たされないようにする
+    serve(app, host="127.0.0.1", port=5000, threads=SERVER_THREADS)
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-import json
 import logging
-from copy import deepcopy
+import os
+import re
+import threading
+import time
 from datetime import date
 from pathlib import Path
-from typing import Any, Iterable
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
 
-from supabase import Client
+import orjson
+
+if TYPE_CHECKING:
+    # Importing supabase pulls in httpx/postgrest/auth; only needed for typing here.
+    from supabase import Client
 
 
 CUSTOM_CLIENT_KEY = "custom"
@@ -16,12 +23,33 @@ DATA_DIR = Path(__file__).resolve().parent / "data"
 DATA_FILE = DATA_DIR / "clients.json"
 
 DEFAULT_SUFFIX_RULE = "日付（月と日）"
-DEFAULT_CLIENTS = [
-    {"key": "am", "name": "AM様", "prefix": "AMS_KTC", "suffix_rule": DEFAULT_SUFFIX_RULE},
-    {"key": "af", "name": "AF様", "prefix": "KTC_SSP", "suffix_rule": DEFAULT_SUFFIX_RULE},
-]
+# Client records are flat str -> str dicts, so dict() is a full copy. The
+# defaults are read-only so fallbacks can share them without copying.
+DEFAULT_CLIENTS: tuple[Mapping[str, str], ...] = (
+    MappingProxyType(
+        {"key": "am", "name": "AM様", "prefix": "AMS_KTC", "suffix_rule": DEFAULT_SUFFIX_RULE}
+    ),
+    MappingProxyType(
+        {"key": "af", "name": "AF様", "prefix": "KTC_SSP", "suffix_rule": DEFAULT_SUFFIX_RULE}
+    ),
+)
+
+CLIENTS_CACHE_TTL = 30.0  # seconds
+# Everything str.isalnum() rejects: \W plus the underscore that \w allows.
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
 
 _SUPABASE: Client | None = None
+_clients_cache: tuple[float, list[dict[str, str]], bytes] | None = None
+_clients_cache_lock = threading.Lock()
+_file_clients_cache: tuple[tuple[int, int], tuple[Mapping[str, str], ...]] | None = None
+_last_saved_clients: tuple[tuple[int, int], bytes] | None = None
+_clients_by_key_cache: tuple[object, dict[str, Mapping[str, str]]] | None = None
+_supabase_clients_cache: tuple[float, tuple[Mapping[str, str], ...]] | None = None
+# Bumped on every invalidation so a fetch that raced a write is not cached.
+# Separate from _clients_cache_lock, which is held while the list is loaded.
+_supabase_cache_lock = threading.Lock()
+_supabase_cache_generation = 0
+_defaults_seeded = False
 LOGGER = logging.getLogger(__name__)
 
 
@@ -31,8 +59,11 @@ class PasswordRuleError(ValueError):
 
 def set_supabase_client(client: Client | None) -> None:
     """Inject Supabase client at runtime and run setup tasks."""
-    global _SUPABASE
+    global _SUPABASE, _defaults_seeded
+    if client is not _SUPABASE:
+        _defaults_seeded = False
     _SUPABASE = client
+    _invalidate_clients_cache()
     if client is None:
         return
 
@@ -46,6 +77,16 @@ def supabase_enabled() -> bool:
     return _SUPABASE is not None
 
 
+def _invalidate_clients_cache() -> None:
+    """Drop the cached client lists so the next read hits storage."""
+    global _clients_cache, _supabase_clients_cache, _supabase_cache_generation
+    with _clients_cache_lock:
+        _clients_cache = None
+    with _supabase_cache_lock:
+        _supabase_clients_cache = None
+        _supabase_cache_generation += 1
+
+
 def _normalize_suffix_rule(value: str | None) -> str:
     text = (value or "").strip()
     return text or DEFAULT_SUFFIX_RULE
@@ -110,7 +151,14 @@ def ensure_clients_table(client: Client) -> None:
 
 
 def _synchronize_fallback_clients(client: Client) -> None:
-    """Seed Supabase with local fallback clients without duplicating."""
+    """Seed Supabase with local fallback clients without duplicating.
+
+    Runs once per client; a failed attempt is retried on the next call.
+    """
+    global _defaults_seeded
+    if _defaults_seeded:
+        return
+
     try:
         response = client.table("clients").select("name,prefix").execute()
         existing_rows = response.data or []
@@ -118,41 +166,51 @@ def _synchronize_fallback_clients(client: Client) -> None:
         LOGGER.warning("Supabase クライアント一覧取得に失敗: %s", exc)
         return
 
-    existing_names = {_casefold(row.get("name")) for row in existing_rows}
-    existing_prefixes = {_casefold(row.get("prefix")) for row in existing_rows}
+    existing_names: set[str] = set()
+    existing_prefixes: set[str] = set()
+    for row in existing_rows:
+        existing_names.add(_casefold(row.get("name")))
+        existing_prefixes.add(_casefold(row.get("prefix")))
 
     try:
         fallback_clients = _load_clients_from_file()
     except PasswordRuleError:
-        fallback_clients = [deepcopy(entry) for entry in DEFAULT_CLIENTS]
+        fallback_clients = DEFAULT_CLIENTS
 
     to_insert: list[dict[str, Any]] = []
     for client_row in fallback_clients:
         name = client_row.get("name")
         prefix = client_row.get("prefix")
-        suffix_rule = _normalize_suffix_rule(client_row.get("suffix_rule"))
-
         if not name or not prefix:
             continue
 
-        if _casefold(name) in existing_names or _casefold(prefix) in existing_prefixes:
+        name_fold = _casefold(name)
+        prefix_fold = _casefold(prefix)
+        if name_fold in existing_names or prefix_fold in existing_prefixes:
             continue
 
         to_insert.append(
             {
                 "name": name,
                 "prefix": prefix,
-                "suffix_rule": suffix_rule,
+                "suffix_rule": _normalize_suffix_rule(client_row.get("suffix_rule")),
             }
         )
+        # Keep the batch itself free of duplicates so one insert cannot trip
+        # the unique indexes.
+        existing_names.add(name_fold)
+        existing_prefixes.add(prefix_fold)
 
     if not to_insert:
+        _defaults_seeded = True
         return
 
     try:
         client.table("clients").insert(to_insert).execute()
     except Exception as exc:  # pragma: no cover - Supabase runtime issues
         LOGGER.warning("Supabase 初期データ挿入に失敗: %s", exc)
+        return
+    _defaults_seeded = True
 
 
 def _format_supabase_client(row: dict[str, Any]) -> dict[str, str]:
@@ -166,7 +224,7 @@ def _format_supabase_client(row: dict[str, Any]) -> dict[str, str]:
 
 def format_mmdd(target_date: date) -> str:
     """Return the MMDD string for the provided date."""
-    return target_date.strftime("%m%d")
+    return f"{target_date.month:02d}{target_date.day:02d}"
 
 
 def ensure_data_file() -> None:
@@ -175,18 +233,25 @@ def ensure_data_file() -> None:
         return
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    DATA_FILE.write_text(
-        json.dumps(DEFAULT_CLIENTS, ensure_ascii=False, indent=2), encoding="utf-8"
+    DATA_FILE.write_bytes(
+        orjson.dumps([dict(entry) for entry in DEFAULT_CLIENTS], option=orjson.OPT_INDENT_2)
     )
 
 
-def _load_clients_from_supabase() -> list[dict[str, str]]:
-    if not supabase_enabled():
+def _load_clients_from_supabase() -> tuple[Mapping[str, str], ...]:
+    global _supabase_clients_cache
+    sb = _SUPABASE
+    if sb is None:
         raise PasswordRuleError("Supabase が初期化されていません。")
 
+    cached = _supabase_clients_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    generation = _supabase_cache_generation
     try:
         response = (
-            _SUPABASE.table("clients")
+            sb.table("clients")
             .select("id,name,prefix,suffix_rule")
             .order("name")
             .execute()
@@ -195,50 +260,90 @@ def _load_clients_from_supabase() -> list[dict[str, str]]:
         raise PasswordRuleError("クライアント情報の取得に失敗しました。") from exc
 
     data = response.data or []
-    formatted = []
+    formatted: list[Mapping[str, str]] = []
     for row in data:
         if not row.get("id"):
             continue
-        formatted.append(_format_supabase_client(row))
-    return formatted
+        formatted.append(MappingProxyType(_format_supabase_client(row)))
+    snapshot = tuple(formatted)
+    with _supabase_cache_lock:
+        if generation == _supabase_cache_generation:
+            _supabase_clients_cache = (time.monotonic() + CLIENTS_CACHE_TTL, snapshot)
+    return snapshot
 
 
-def _load_clients_from_file() -> list[dict[str, str]]:
+def _stat_data_file() -> os.stat_result:
+    # One stat in the common case; seed the defaults only when the file is missing.
     try:
+        return DATA_FILE.stat()
+    except FileNotFoundError:
         ensure_data_file()
+        return DATA_FILE.stat()
+
+
+def _file_stamp(stat: os.stat_result) -> tuple[int, int]:
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_clients_from_file() -> tuple[Mapping[str, str], ...]:
+    global _file_clients_cache
+    try:
+        stat = _stat_data_file()
     except OSError:
-        return [deepcopy(entry) for entry in DEFAULT_CLIENTS]
+        return DEFAULT_CLIENTS
+
+    # Reuse the parsed file while its mtime/size are unchanged.
+    stamp = _file_stamp(stat)
+    cached = _file_clients_cache
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
 
     try:
-        data_text = DATA_FILE.read_text(encoding="utf-8")
+        data_bytes = DATA_FILE.read_bytes()
     except (FileNotFoundError, OSError):
-        return [deepcopy(entry) for entry in DEFAULT_CLIENTS]
+        return DEFAULT_CLIENTS
 
     try:
-        data = json.loads(data_text)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(data_bytes)
+    except orjson.JSONDecodeError as exc:
         raise PasswordRuleError("クライアント設定ファイルが壊れています。") from exc
 
     if not isinstance(data, list):
         raise PasswordRuleError("クライアント設定ファイルの形式が不正です。")
 
-    results: list[dict[str, str]] = []
+    results: list[Mapping[str, str]] = []
     for entry in data:
-        copied = deepcopy(entry)
+        copied = dict(entry)
         copied.setdefault("suffix_rule", DEFAULT_SUFFIX_RULE)
-        results.append(copied)
-    return results
+        results.append(MappingProxyType(copied))
+    snapshot = tuple(results)
+    _file_clients_cache = (stamp, snapshot)
+    return snapshot
+
 
+def load_clients() -> list[Mapping[str, str]]:
+    """Load client records from Supabase when available, fallback to local file.
 
-def load_clients() -> list[dict[str, str]]:
-    """Load client records from Supabase when available, fallback to local file."""
+    File-backed entries are shared read-only views; use ``_load_clients_mutable``
+    when the records need to be edited.
+    """
+    return list(_load_clients_snapshot())
+
+
+def _load_clients_snapshot() -> tuple[Mapping[str, str], ...]:
+    """Return the shared, immutable client tuple from the active backend."""
     if supabase_enabled():
         return _load_clients_from_supabase()
     return _load_clients_from_file()
 
 
-def save_clients(clients: list[dict[str, str]]) -> None:
+def _load_clients_mutable() -> list[dict[str, str]]:
+    return [dict(entry) for entry in load_clients()]
+
+
+def save_clients(clients: Iterable[Mapping[str, str]]) -> None:
     """Persist client records to fallback storage only."""
+    global _file_clients_cache, _last_saved_clients
     serialized = []
     for client in clients:
         entry = {
@@ -249,71 +354,113 @@ def save_clients(clients: list[dict[str, str]]) -> None:
         }
         serialized.append(entry)
 
+    payload = orjson.dumps(serialized, option=orjson.OPT_INDENT_2)
+
+    # Skip the write when this payload is exactly what we last wrote and the
+    # file has not been touched since.
+    last_saved = _last_saved_clients
+    if last_saved is not None and last_saved[1] == payload:
+        try:
+            if _file_stamp(DATA_FILE.stat()) == last_saved[0]:
+                return
+        except OSError:
+            pass
+
+    _file_clients_cache = None
+    # Write a sibling temp file and swap it in so concurrent readers never see
+    # a partially written clients.json.
+    tmp_file = DATA_FILE.with_name(
+        f".{DATA_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
     try:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        DATA_FILE.write_text(
-            json.dumps(serialized, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, DATA_FILE)
+        stamp = _file_stamp(DATA_FILE.stat())
     except OSError as exc:
+        tmp_file.unlink(missing_ok=True)
         raise PasswordRuleError(
             "クライアント情報を保存できません。サーバーの書き込み権限を確認してください。"
         ) from exc
+    _last_saved_clients = (stamp, payload)
+    # Seed the read cache with what was just written so the next load skips
+    # re-reading and re-parsing the file.
+    _file_clients_cache = (stamp, tuple(MappingProxyType(entry) for entry in serialized))
 
 
 def _casefold(value: str) -> str:
     return (value or "").casefold()
 
 
-def _validate_client_inputs(name: str, prefix: str) -> tuple[str, str]:
+def _normalize_client_fields(
+    name: str, prefix: str, suffix_rule: str | None
+) -> tuple[str, str, str]:
+    """Validate and trim name/prefix and normalize the suffix rule in one pass."""
     trimmed_name = (name or "").strip()
-    trimmed_prefix = (prefix or "").strip()
     if not trimmed_name:
         raise PasswordRuleError("クライアント名を入力してください。")
+    trimmed_prefix = (prefix or "").strip()
     if not trimmed_prefix:
         raise PasswordRuleError("接頭語を入力してください。")
-    return trimmed_name, trimmed_prefix
+    return trimmed_name, trimmed_prefix, _normalize_suffix_rule(suffix_rule)
 
 
 def _ensure_unique(
     name: str,
     prefix: str,
-    clients: Iterable[dict[str, str]],
+    clients: Iterable[Mapping[str, str]],
     *,
     exclude_key: str | None = None,
 ) -> None:
-    name_fold = _casefold(name)
-    prefix_fold = _casefold(prefix)
+    exclude_fold = _casefold(exclude_key) if exclude_key else None
+    names: set[str] = set()
+    prefixes: set[str] = set()
     for client in clients:
-        if exclude_key and _casefold(client.get("key")) == _casefold(exclude_key):
+        if exclude_fold is not None and _casefold(client.get("key")) == exclude_fold:
             continue
+        names.add(_casefold(client.get("name")))
+        prefixes.add(_casefold(client.get("prefix")))
 
-        if _casefold(client.get("name")) == name_fold:
-            raise PasswordRuleError(f"{name} は既に登録されています。")
-        if _casefold(client.get("prefix")) == prefix_fold:
-            raise PasswordRuleError(f"{prefix} は既に登録されています。")
+    if _casefold(name) in names:
+        raise PasswordRuleError(f"{name} は既に登録されています。")
+    if _casefold(prefix) in prefixes:
+        raise PasswordRuleError(f"{prefix} は既に登録されています。")
+
+
+def _unique_violation_value(exc: Exception, name: str, prefix: str) -> str | None:
+    """Return the conflicting value when ``exc`` is a clients unique-index violation."""
+    message = str(exc)
+    if getattr(exc, "code", None) != "23505" and "duplicate key" not in message:
+        return None
+    # Match the index/column, not the word: a client name may contain "prefix".
+    if "clients_prefix_lower_idx" in message or "(lower(prefix))" in message:
+        return prefix
+    return name
 
 
 def add_client_rule(name: str, prefix: str, suffix_rule: str | None = None) -> dict[str, object]:
     """Add a new client rule using Supabase when available."""
-    trimmed_name, trimmed_prefix = _validate_client_inputs(name, prefix)
-    normalized_suffix = _normalize_suffix_rule(suffix_rule)
-    clients = load_clients()
+    trimmed_name, trimmed_prefix, normalized_suffix = _normalize_client_fields(
+        name, prefix, suffix_rule
+    )
+    clients = _load_clients_mutable()
 
-    try:
-        _ensure_unique(trimmed_name, trimmed_prefix, clients)
-    except PasswordRuleError as err:
+    clients_by_name = {_casefold(client.get("name")): client for client in clients}
+    existing_prefixes = {_casefold(client.get("prefix")) for client in clients}
+    existing_client = clients_by_name.get(_casefold(trimmed_name))
+    if existing_client is not None or _casefold(trimmed_prefix) in existing_prefixes:
+        duplicate = trimmed_name if existing_client is not None else trimmed_prefix
         return {
             "created": False,
-            "client": next(
-                (client for client in clients if client["name"] == trimmed_name), None
-            ),
-            "message": str(err),
+            "client": existing_client,
+            "message": f"{duplicate} は既に登録されています。",
         }
 
-    if supabase_enabled():
+    sb = _SUPABASE
+    if sb is not None:
         try:
             response = (
-                _SUPABASE.table("clients")
+                sb.table("clients")
                 .insert(
                     {
                         "name": trimmed_name,
@@ -324,7 +471,16 @@ def add_client_rule(name: str, prefix: str, suffix_rule: str | None = None) -> d
                 .execute()
             )
         except Exception as exc:
-            raise PasswordRuleError("クライアントの保存に失敗しました。") from exc
+            # Another instance may have inserted the same name/prefix since our
+            # cached snapshot; the unique indexes catch that race.
+            duplicate = _unique_violation_value(exc, trimmed_name, trimmed_prefix)
+            if duplicate is None:
+                raise PasswordRuleError("クライアントの保存に失敗しました。") from exc
+            return {
+                "created": False,
+                "client": None,
+                "message": f"{duplicate} は既に登録されています。",
+            }
 
         data = response.data[0] if response.data else {}
         client_entry = _format_supabase_client(
@@ -347,6 +503,7 @@ def add_client_rule(name: str, prefix: str, suffix_rule: str | None = None) -> d
         clients.append(client_entry)
         save_clients(clients)
 
+    _invalidate_clients_cache()
     return {
         "created": True,
         "client": client_entry,
@@ -362,10 +519,11 @@ def update_client_rule(
     if not normalized_key:
         raise PasswordRuleError("更新するクライアントを選択してください。")
 
-    trimmed_name, trimmed_prefix = _validate_client_inputs(name, prefix)
-    normalized_suffix = _normalize_suffix_rule(suffix_rule)
+    trimmed_name, trimmed_prefix, normalized_suffix = _normalize_client_fields(
+        name, prefix, suffix_rule
+    )
 
-    clients = load_clients()
+    clients = _load_clients_mutable()
     _ensure_unique(
         trimmed_name,
         trimmed_prefix,
@@ -373,39 +531,32 @@ def update_client_rule(
         exclude_key=normalized_key,
     )
 
-    if supabase_enabled():
+    sb = _SUPABASE
+    if sb is not None:
+        # PostgREST returns the updated rows, so an empty result means no match.
         try:
-            existing_response = (
-                _SUPABASE.table("clients")
-                .select("id,name,prefix,suffix_rule")
+            response = (
+                sb.table("clients")
+                .update(
+                    {
+                        "name": trimmed_name,
+                        "prefix": trimmed_prefix,
+                        "suffix_rule": normalized_suffix,
+                    }
+                )
                 .eq("id", normalized_key)
-                .limit(1)
                 .execute()
             )
         except Exception as exc:
-            raise PasswordRuleError("クライアント情報の取得に失敗しました。") from exc
-
-        existing_rows = existing_response.data or []
-        if not existing_rows:
-            raise PasswordRuleError("指定されたクライアントは存在しません。")
-
-        try:
-            _SUPABASE.table("clients").update(
-                {
-                    "name": trimmed_name,
-                    "prefix": trimmed_prefix,
-                    "suffix_rule": normalized_suffix,
-                }
-            ).eq("id", normalized_key).execute()
-        except Exception as exc:
+            duplicate = _unique_violation_value(exc, trimmed_name, trimmed_prefix)
+            if duplicate is not None:
+                raise PasswordRuleError(f"{duplicate} は既に登録されています。") from exc
             raise PasswordRuleError("クライアントの更新に失敗しました。") from exc
 
-        updated_client = {
-            "key": normalized_key,
-            "name": trimmed_name,
-            "prefix": trimmed_prefix,
-            "suffix_rule": normalized_suffix,
-        }
+        updated_rows = response.data or []
+        if not updated_rows:
+            raise PasswordRuleError("指定されたクライアントは存在しません。")
+        updated_client = _format_supabase_client(updated_rows[0])
     else:
         target_client = None
         for entry in clients:
@@ -426,6 +577,7 @@ def update_client_rule(
         save_clients(clients)
         updated_client = target_client
 
+    _invalidate_clients_cache()
     return {
         "updated": True,
         "client": updated_client,
@@ -433,28 +585,44 @@ def update_client_rule(
     }
 
 
+def _clients_by_key() -> Mapping[str, Mapping[str, str]]:
+    """Return ``{key: client}`` for the current snapshot, rebuilt only when it changes."""
+    global _clients_by_key_cache
+    # Index exactly the tuple just loaded; cache hits and the DEFAULT_CLIENTS
+    # fallback hand back the same object, so the index is reused for them.
+    snapshot = _load_clients_snapshot()
+    cached = _clients_by_key_cache
+    if cached is not None and cached[0] is snapshot:
+        return cached[1]
+
+    by_key = {client["key"]: client for client in snapshot}
+    _clients_by_key_cache = (snapshot, by_key)
+    return by_key
+
+
 def generate_password(client_key: str, target_date: date) -> str:
     """Generate password using the fixed rule for the specified client and date."""
-    if supabase_enabled():
+    client = _clients_by_key().get(client_key)
+    sb = _SUPABASE
+    if client is None and sb is not None:
+        # Not in the cached snapshot; it may have been added by another instance.
         try:
             response = (
-                _SUPABASE.table("clients")
-                .select("id,name,prefix,suffix_rule")
+                sb.table("clients")
+                .select("prefix")
                 .eq("id", client_key)
+                .limit(1)
                 .execute()
             )
         except Exception as exc:
             raise PasswordRuleError("クライアント情報の取得に失敗しました。") from exc
 
         data = response.data or []
-        if not data:
-            raise PasswordRuleError(f"未対応のクライアントです: {client_key}")
-        client = _format_supabase_client(data[0])
-    else:
-        clients = {client["key"]: client for client in load_clients()}
-        client = clients.get(client_key)
-        if not client:
-            raise PasswordRuleError(f"未対応のクライアントです: {client_key}")
+        if data:
+            client = data[0]
+
+    if not client:
+        raise PasswordRuleError(f"未対応のクライアントです: {client_key}")
 
     prefix = client["prefix"]
     suffix = format_mmdd(target_date)
@@ -462,7 +630,37 @@ def generate_password(client_key: str, target_date: date) -> str:
 
 
 def get_available_clients() -> list[dict[str, str]]:
-    """Return client metadata for UI consumption."""
+    """Return client metadata for UI consumption.
+
+    The result is cached for ``CLIENTS_CACHE_TTL`` seconds and shared between
+    callers, so it must be treated as read-only.
+    """
+    return _cached_available_clients()[1]
+
+
+def get_available_clients_json() -> bytes:
+    """Return the ``{"clients": [...]}`` API body, serialized once per cache fill."""
+    return _cached_available_clients()[2]
+
+
+def _cached_available_clients() -> tuple[float, list[dict[str, str]], bytes]:
+    global _clients_cache
+    with _clients_cache_lock:
+        cached = _clients_cache
+        if cached and cached[0] > time.monotonic():
+            return cached
+
+        clients = _build_available_clients()
+        cached = (
+            time.monotonic() + CLIENTS_CACHE_TTL,
+            clients,
+            orjson.dumps({"clients": clients}),
+        )
+        _clients_cache = cached
+        return cached
+
+
+def _build_available_clients() -> list[dict[str, str]]:
     clients = [
         {
             "key": client["key"],
@@ -493,17 +691,17 @@ def build_custom_password(raw_value: str, target_date: date | None) -> str:
     if not target_date:
         return user_input
 
-    suffix = target_date.strftime("%Y%m%d")
+    suffix = f"{target_date.year:04d}{target_date.month:02d}{target_date.day:02d}"
     return f"{user_input}{suffix}"
 
 
 def _generate_key(name: str, prefix: str, existing_keys: set[str]) -> str:
     """Generate a stable key from provided name/prefix."""
-    base = "".join(ch for ch in name.lower() if ch.isalnum())
-    if not base:
-        base = "".join(ch for ch in prefix.lower() if ch.isalnum())
-    if not base:
-        base = "client"
+    base = (
+        _NON_ALNUM_RE.sub("", name.lower())
+        or _NON_ALNUM_RE.sub("", prefix.lower())
+        or "client"
+    )
 
     candidate = base
     counter = 1
@@ -521,32 +719,26 @@ def delete_client_rule(key: str) -> dict[str, object]:
     if normalized_key == CUSTOM_CLIENT_KEY:
         raise PasswordRuleError("Custom は削除できません。")
 
-    if supabase_enabled():
+    sb = _SUPABASE
+    if sb is not None:
+        # PostgREST returns the deleted rows, so an empty result means no match.
         try:
-            response = (
-                _SUPABASE.table("clients")
-                .select("id,name,prefix,suffix_rule")
-                .eq("id", normalized_key)
-                .execute()
-            )
+            response = sb.table("clients").delete().eq("id", normalized_key).execute()
         except Exception as exc:
-            raise PasswordRuleError("クライアント情報の取得に失敗しました。") from exc
+            raise PasswordRuleError("クライアントの削除に失敗しました。") from exc
 
         data = response.data or []
         if not data:
             raise PasswordRuleError("指定されたクライアントは存在しません。")
         removed_client = _format_supabase_client(data[0])
-        try:
-            _SUPABASE.table("clients").delete().eq("id", normalized_key).execute()
-        except Exception as exc:
-            raise PasswordRuleError("クライアントの削除に失敗しました。") from exc
+        _invalidate_clients_cache()
         return {
             "deleted": True,
             "client": removed_client,
             "message": f"{removed_client['name']} を削除しました。",
         }
 
-    clients = load_clients()
+    clients = _load_clients_mutable()
     remaining = []
     removed_client = None
 
@@ -560,6 +752,7 @@ def delete_client_rule(key: str) -> dict[str, object]:
         raise PasswordRuleError("指定されたクライアントは存在しません。")
 
     save_clients(remaining)
+    _invalidate_clients_cache()
     return {
         "deleted": True,
         "client": removed_client,